@@ -4,7 +4,7 @@ from sqlalchemy import engine_from_config, pool
 from sqlmodel import SQLModel
 
 from alembic import context
-from src.core.config import settings
+from src.core.config import get_settings
 
 config = context.config
 
@@ -15,7 +15,7 @@ if config.config_file_name is not None:
 target_metadata = SQLModel.metadata
 
 # Override the URL from our settings
-config.set_main_option("sqlalchemy.url", settings.database_url)
+config.set_main_option("sqlalchemy.url", get_settings().database_url)
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,30 @@
+"""add cluster version
+
+Revision ID: 2b6e9c41d0fa
+Revises: 8f3a1d2c4b7e
+Create Date: 2026-10-18 14:03:52.118044
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2b6e9c41d0fa"
+down_revision: Union[str, Sequence[str], None] = "8f3a1d2c4b7e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("clustermodel", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("clustermodel", "version")
@@ -0,0 +1,37 @@
+"""add revoked token table
+
+Revision ID: 7c2e5a90b1d4
+Revises: d41f7a9b3c52
+Create Date: 2026-10-18 19:42:17.530612
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2e5a90b1d4"
+down_revision: Union[str, Sequence[str], None] = "d41f7a9b3c52"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "revokedtokenmodel",
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(op.f("ix_revokedtokenmodel_expires_at"), "revokedtokenmodel", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_revokedtokenmodel_expires_at"), table_name="revokedtokenmodel")
+    op.drop_table("revokedtokenmodel")
@@ -0,0 +1,32 @@
+"""add cluster listing indexes
+
+Revision ID: 8f3a1d2c4b7e
+Revises: c5bad2a6c9e3
+Create Date: 2026-10-18 10:12:31.402817
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8f3a1d2c4b7e"
+down_revision: Union[str, Sequence[str], None] = "c5bad2a6c9e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_clustermodel_org_name", "clustermodel", ["org", "name", "id"], unique=False)
+    op.create_index("ix_clustermodel_owner_name", "clustermodel", ["owner", "name", "id"], unique=False)
+    op.create_index("ix_clustermodel_is_active_name", "clustermodel", ["is_active", "name", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_clustermodel_is_active_name", table_name="clustermodel")
+    op.drop_index("ix_clustermodel_owner_name", table_name="clustermodel")
+    op.drop_index("ix_clustermodel_org_name", table_name="clustermodel")
@@ -0,0 +1,40 @@
+"""add cluster search indexes
+
+Revision ID: d41f7a9b3c52
+Revises: 2b6e9c41d0fa
+Create Date: 2026-10-18 17:26:09.874311
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f7a9b3c52"
+down_revision: Union[str, Sequence[str], None] = "2b6e9c41d0fa"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ("name", "owner", "org")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Trigram and pattern-ops indexes are Postgres features; SQLite (dev) falls back to scans.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_clustermodel_name_prefix ON clustermodel (lower(name) text_pattern_ops)")
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"CREATE INDEX ix_clustermodel_{column}_trgm ON clustermodel USING gin (lower({column}) gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for column in TRIGRAM_COLUMNS:
+        op.execute(f"DROP INDEX IF EXISTS ix_clustermodel_{column}_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_clustermodel_name_prefix")
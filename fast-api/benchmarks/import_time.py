@@ -0,0 +1,118 @@
+"""
+Import-time profile and budget check for the API process, built on `python -X importtime`.
+
+Every module is imported in a fresh interpreter with DATABASE_URL and SECRET_KEY removed from the environment,
+so the run also proves that importing builds no settings, engine or other configured singleton. The median
+cumulative import time over --runs is compared with each module's budget, and the heaviest top-level packages
+behind the slowest module are listed so a regression points at its cause.
+
+Run from fast-api/:
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --runs 9 --budget main=800
+
+Exits non-zero when a module is over budget, fails to import without configuration, or builds a singleton at import.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Milliseconds of cumulative import time. Most of it is fastapi, sqlalchemy and pydantic themselves.
+DEFAULT_BUDGETS = {"src.core.config": 350, "src.core.security": 400, "src.core.db": 900, "main": 1500}
+
+# Accessors that must not have run just because the app was imported.
+LAZY_CHECK = """
+import main
+from src.auth.dependencies import get_verified_tokens
+from src.auth.revocation import get_revocation_list
+from src.clusters.events import get_change_feed
+from src.core.cache import get_cache
+from src.core.config import get_settings
+from src.core.db import get_engine
+from src.core.security import get_password_hasher
+
+accessors = (get_settings, get_engine, get_cache, get_password_hasher, get_change_feed, get_revocation_list, get_verified_tokens)
+built = [accessor.__name__ for accessor in accessors if accessor.cache_info().currsize]
+assert not built, "built at import: " + ", ".join(built)
+"""
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_budget(value: str) -> tuple[str, float]:
+    module, budget = value.split("=")
+    return module.strip(), float(budget)
+
+
+def bare_env() -> dict:
+    return {key: value for key, value in os.environ.items() if key not in ("DATABASE_URL", "SECRET_KEY")}
+
+
+def import_profile(module: str) -> list[tuple[int, int, str]]:
+    """(self us, cumulative us, dotted name) for every import, as reported by -X importtime."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=APP_ROOT, env=bare_env(), capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed without DATABASE_URL/SECRET_KEY:\n{completed.stderr[-2000:]}")
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        entries.append((int(own), int(cumulative), name.strip()))
+    return entries
+
+
+def cumulative_ms(entries: list[tuple[int, int, str]], module: str) -> float:
+    return next(cumulative for _, cumulative, name in entries if name == module) / 1000
+
+
+def heaviest_packages(entries: list[tuple[int, int, str]], top: int) -> list[tuple[str, float]]:
+    totals = Counter()
+    for own, _, name in entries:
+        totals[name.split(".")[0]] += own
+    return [(package, own / 1000) for package, own in totals.most_common(top)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module; the median is reported")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[], help="module=ms, overrides or adds a budget")
+    parser.add_argument("--top", type=int, default=12, help="packages to list for the slowest module")
+    args = parser.parse_args()
+    budgets = {**DEFAULT_BUDGETS, **dict(args.budget)}
+
+    ok = True
+    profiles = {}
+    print(f"{'module':20} {'median ms':>10} {'budget ms':>10}")
+    for module, budget in budgets.items():
+        runs = [import_profile(module) for _ in range(args.runs)]
+        runs.sort(key=lambda entries: cumulative_ms(entries, module))
+        entries = runs[len(runs) // 2]
+        median = cumulative_ms(entries, module)
+        profiles[module] = (median, entries)
+        over = median > budget
+        ok = ok and not over
+        print(f"{module:20} {median:>10.1f} {budget:>10.0f}{'   OVER BUDGET' if over else ''}")
+
+    slowest = max(profiles, key=lambda module: profiles[module][0])
+    print(f"\nself time by top-level package while importing {slowest}:")
+    for package, own in heaviest_packages(profiles[slowest][1], args.top):
+        print(f"  {own:8.1f} ms  {package}")
+
+    lazy = subprocess.run([sys.executable, "-c", LAZY_CHECK], cwd=APP_ROOT, env=bare_env(), capture_output=True, text=True)
+    if lazy.returncode == 0:
+        print("\nno settings, engine or configured singleton is built at import")
+    else:
+        ok = False
+        print(f"\nlazy construction check failed:\n{lazy.stderr.strip().splitlines()[-1]}")
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-read cost of the MCP clusters:// resource for each MCP_TRANSPORT backend, uncached and through the
+server's resource cache.
+
+"asgi" and "direct" run in-process against the configured database. "http" is timed only when
+--base-url points at a running API (e.g. `make run`). MCP protocol framing is excluded: this is the
+cost the backend adds to every resource read. CACHE_BACKEND applies as usual; with the default memory
+cache a direct read is a cache hit after the first call.
+
+"+cache" rows are reads within the TTL, served from memory. "+revalidate" rows use a zero TTL, so every
+read sends the cached ETag and the API answers 304 without a body.
+
+Run from fast-api/:
+    python -m benchmarks.mcp_transport --reads 2000
+    python -m benchmarks.mcp_transport --base-url http://localhost:8000/api/v1
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+SERVER_PATH = Path(__file__).resolve().parent.parent / "src" / "mcp-server" / "server.py"
+
+
+def load_server():
+    # The MCP server lives in a hyphenated directory, so it is loaded by path rather than imported.
+    spec = importlib.util.spec_from_file_location("mcp_server", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    # FastMCP configures root INFO logging on import, which would log every timed request and pool event.
+    logging.getLogger().setLevel(logging.WARNING)
+    return module
+
+
+async def time_reads(read, reads: int) -> list[float]:
+    await read()
+    samples = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        await read()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+async def main(args):
+    import httpx
+
+    from benchmarks.load import percentile, seed
+    from main import app
+
+    seed(args.database_url, args.clusters, 1)
+    server = load_server()
+    backends = {
+        "asgi": server.ApiBackend(httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp/api/v1")),
+        "direct": server.ServiceBackend(),
+    }
+    if args.base_url:
+        backends = {"http": server.ApiBackend(httpx.AsyncClient(base_url=args.base_url)), **backends}
+
+    print(f"{'transport':18} {'p50 us':>10} {'p99 us':>10}")
+    async with app.router.lifespan_context(app):
+        for name, backend in backends.items():
+            cached = server.ResourceCache(ttl=60.0, max_entries=16)
+            revalidated = server.ResourceCache(ttl=0.0, max_entries=16)
+            variants = {
+                name: backend.get_all_clusters,
+                f"{name}+cache": lambda cache=cached, backend=backend: cache.read(server.CLUSTER_LIST_URI, backend.get_all_clusters),
+                f"{name}+revalidate": lambda cache=revalidated, backend=backend: cache.read(server.CLUSTER_LIST_URI, backend.get_all_clusters),
+            }
+            for label, read in variants.items():
+                samples = await time_reads(read, args.reads)
+                print(f"{label:18} {percentile(samples, 50) * 1e6:>10.1f} {percentile(samples, 99) * 1e6:>10.1f}")
+            await backend.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=f"sqlite:///{Path(tempfile.gettempdir()) / 'fastapi-mcp-bench.db'}")
+    parser.add_argument("--reads", type=int, default=1000)
+    parser.add_argument("--clusters", type=int, default=100, help="rows seeded; the resource returns the first page")
+    parser.add_argument("--base-url", help="API base URL for timing the remote http transport")
+    args = parser.parse_args()
+    # Seeding replaces every row, so the database is always explicit (a scratch SQLite file by default).
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    asyncio.run(main(args))
@@ -0,0 +1,72 @@
+"""
+Cost of rendering a large cluster list: response_model re-validation + stdlib json versus the
+pre-shaped rows handed straight to ORJSONResponse that the list endpoint now uses, on both a
+cache miss (rows dumped once) and a cache hit (rows already dumped).
+
+Run from fast-api/ with DATABASE_URL and SECRET_KEY set:
+    python -m benchmarks.serialization --clusters 10000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.clusters.models import ClusterModel
+from src.clusters.schemas import ClusterPage
+
+
+def build_app(clusters: int) -> FastAPI:
+    rows = [
+        ClusterModel(id=uuid4(), name=f"cluster-{i:06d}", owner=f"owner-{i % 50}", org=f"org-{i % 10}", is_active=i % 2 == 0, version=1)
+        for i in range(clusters)
+    ]
+    page = {"items": [row.model_dump(mode="json") for row in rows], "next_cursor": None}
+    app = FastAPI()
+
+    @app.get("/validated", response_model=ClusterPage, response_class=JSONResponse)
+    async def validated():
+        return {"items": rows, "next_cursor": None}
+
+    @app.get("/dumped", response_model=ClusterPage)
+    async def dumped():
+        # Cache miss: rows are dumped once, then rendered without re-validation.
+        return ORJSONResponse({"items": [row.model_dump(mode="json") for row in rows], "next_cursor": None})
+
+    @app.get("/trusted", response_model=ClusterPage)
+    async def trusted():
+        return ORJSONResponse(page)
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int) -> tuple[float, int]:
+    size = len((await client.get(path)).content)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        (await client.get(path)).raise_for_status()
+    return (time.perf_counter() - start) / iterations, size
+
+
+async def main(clusters: int, iterations: int):
+    app = build_app(clusters)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        validated, validated_size = await measure(client, "/validated", iterations)
+        dumped, _ = await measure(client, "/dumped", iterations)
+        trusted, trusted_size = await measure(client, "/trusted", iterations)
+    print(f"clusters                      {clusters}")
+    print(f"response_model + json         {validated * 1000:8.2f} ms/response  ({validated_size} bytes)")
+    print(f"model_dump + orjson (miss)    {dumped * 1000:8.2f} ms/response  ({validated / dumped:.1f}x)")
+    print(f"cached rows + orjson (hit)    {trusted * 1000:8.2f} ms/response  ({validated / trusted:.1f}x, {trusted_size} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clusters", type=int, default=10_000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.clusters, args.iterations))
@@ -0,0 +1,63 @@
+"""
+Fire N concurrent identical GET /clusters/{name} and GET /clusters/ requests and check that the
+single-flight layer turns each burst into exactly one SQL query. Exits non-zero if it does not.
+
+The read-through cache is disabled for the run so every request really reaches ClusterService.
+
+Run from fast-api/:
+    python -m benchmarks.single_flight --requests 1000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+
+async def burst(client, path: str, requests: int, statements: list[str]) -> int:
+    before = len(statements)
+    responses = await asyncio.gather(*(client.get(path) for _ in range(requests)))
+    assert all(response.status_code == 200 for response in responses), {response.status_code for response in responses}
+    assert len({response.content for response in responses}) == 1
+    return sum(1 for statement in statements[before:] if "FROM clustermodel" in statement)
+
+
+async def main(requests: int) -> bool:
+    import httpx
+    from sqlalchemy import event
+    from sqlmodel import Session, SQLModel, create_engine, delete
+
+    from main import app
+    from src.clusters.models import ClusterModel
+    from src.core.db import get_engine
+
+    sync_engine = create_engine(os.environ["DATABASE_URL"])
+    SQLModel.metadata.create_all(sync_engine)
+    with Session(sync_engine) as session:
+        session.exec(delete(ClusterModel))
+        session.add(ClusterModel(name="hot-cluster", owner="oncall", org="sre", is_active=True))
+        session.commit()
+    sync_engine.dispose()
+
+    statements: list[str] = []
+    event.listen(get_engine().sync_engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+
+    ok = True
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for path in ("/api/v1/clusters/hot-cluster", "/api/v1/clusters/"):
+            queries = await burst(client, path, requests, statements)
+            print(f"{requests} concurrent GET {path} -> {queries} query(ies)")
+            ok = ok and queries == 1
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'fastapi-single-flight.db'}")
+    os.environ.setdefault("SECRET_KEY", "bench-secret")
+    os.environ["CACHE_BACKEND"] = "none"
+    sys.exit(0 if asyncio.run(main(args.requests)) else 1)
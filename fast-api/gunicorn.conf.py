@@ -0,0 +1,52 @@
+"""
+Gunicorn settings for multi-process serving. Run `make serve` (or plain `gunicorn`) from fast-api/.
+
+The app is imported once in the master and forked, so workers share its code pages copy-on-write. Each worker
+then warms its own engine pool, bcrypt threads and OpenAPI schema in the lifespan before accepting requests.
+
+State across workers:
+    DB connections  per worker: workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) must fit the server's max_connections.
+    Read cache      shared: with more than one worker CACHE_BACKEND defaults to redis (REDIS_URL), so every worker
+                    sees every invalidation. CACHE_BACKEND=none also works; memory is refused at startup.
+    Change feed     shared: CHANGE_FEED_BACKEND defaults to redis, one stream and sequence for all workers, so any
+                    worker streams every write and resumes any Last-Event-ID. memory is refused at startup.
+    Revocations     shared through the revokedtokenmodel table, seen by other workers within REVOCATION_SYNC_SECONDS.
+"""
+
+import multiprocessing
+import os
+
+wsgi_app = "main:app"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+# One event loop per core; the request path is async, so extra workers per core only add contention.
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Settings read this to default to (and insist on) shared cache and change feed backends.
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "src.core.worker.AppWorker"
+preload_app = True
+
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+# SIGTERM stops accepting connections and waits this long for in-flight requests before the worker is killed.
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+timeout = int(os.environ.get("WORKER_TIMEOUT", 60))
+# Optional worker recycling, jittered so workers do not all restart (and re-warm) at once.
+max_requests = int(os.environ.get("MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.environ.get("ACCESS_LOG")
+errorlog = "-"
+
+
+def on_starting(server):
+    from src.core.config import get_settings
+
+    # Fail in the master with the settings error, rather than in every worker's lifespan.
+    get_settings()
+
+
+def post_fork(server, worker):
+    from src.core.db import get_engine
+
+    # The engine is normally first built in each worker's lifespan; if preloading built it, drop what the child inherited.
+    if get_engine.cache_info().currsize:
+        get_engine().sync_engine.dispose(close=False)
@@ -1,17 +1,42 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
+from src.auth.revocation import get_revocation_list
 from src.auth.routes import auth_router
+from src.clusters.events import get_change_feed
 from src.clusters.routes import cluster_router
+from src.core.config import get_settings
+from src.core.db import get_engine, warm_pool
+from src.core.metrics import MetricsMiddleware
+from src.core.routes import metrics_router, ops_router
+from src.core.security import get_password_hasher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Pay every first-request cost here, before the server accepts traffic on this worker.
+    password_hasher, revocation_list, change_feed = get_password_hasher(), get_revocation_list(), get_change_feed()
+    await asyncio.gather(warm_pool(), password_hasher.warm_up(), revocation_list.sync(), change_feed.start())
+    app.openapi()
+    revocation_sync = asyncio.create_task(revocation_list.run_sync(get_settings().revocation_sync_seconds))
+    change_feed_reader = asyncio.create_task(change_feed.run())
     yield
+    # The server has already drained in-flight requests by the time shutdown runs.
+    revocation_sync.cancel()
+    await change_feed.close()
+    change_feed_reader.cancel()
+    await asyncio.gather(change_feed_reader, return_exceptions=True)
+    password_hasher.shutdown()
+    await get_engine().dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(cluster_router, prefix="/api/v1")
 app.include_router(auth_router, prefix="/api/v1")
+app.include_router(ops_router, prefix="/api/v1")
+app.include_router(metrics_router)
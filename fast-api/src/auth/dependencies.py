@@ -1,13 +1,48 @@
+import hashlib
+import time
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
+from src.auth.revocation import get_revocation_list
+from src.core.cache import MemoryCacheBackend
+from src.core.config import get_settings
+from src.core.metrics import jwt_verify_duration, token_cache_lookups
 from src.core.security import verify_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)):
+# Verified payloads keyed by a digest of the token, each held only until the token's own exp.
+@lru_cache
+def get_verified_tokens() -> MemoryCacheBackend:
+    return MemoryCacheBackend(get_settings().token_cache_max_entries)
+
+
+async def _verified_payload(token: str):
+    token_digest = hashlib.sha256(token.encode()).hexdigest()
+    verified_tokens = get_verified_tokens()
+    payload = await verified_tokens.get(token_digest)
+    if payload is not None:
+        token_cache_lookups.inc("hit")
+        return payload
+
+    token_cache_lookups.inc("miss")
+    start = time.perf_counter()
     payload = verify_token(token)
-    if payload is None:
+    jwt_verify_duration.observe(time.perf_counter() - start)
+    # Refresh tokens are only accepted by /auth/refresh, never as bearer credentials.
+    if payload is None or payload.get("type", "access") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if "exp" in payload:
+        await verified_tokens.set(token_digest, payload, payload["exp"] - time.time())
+    return payload
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)):
+    payload = await _verified_payload(token)
+    # Checked on cache hits too, so a revocation takes effect before the cached entry expires.
+    if "jti" in payload and await get_revocation_list().is_revoked(payload["jti"]):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked")
     return payload
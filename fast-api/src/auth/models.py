@@ -1,3 +1,4 @@
+from datetime import datetime
 from uuid import UUID, uuid4
 
 from sqlmodel import Field, SQLModel
@@ -9,3 +10,9 @@ class AuthModel(SQLModel, table=True):
     name: str
     email: str = Field(index=True, unique=True)
     password: str
+
+
+class RevokedTokenModel(SQLModel, table=True):
+    jti: str = Field(primary_key=True)
+    # Rows are only needed until the token would have expired anyway.
+    expires_at: datetime = Field(index=True)
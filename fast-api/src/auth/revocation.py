@@ -0,0 +1,119 @@
+import asyncio
+import hashlib
+import logging
+import math
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.models import RevokedTokenModel
+from src.core.config import get_settings
+from src.core.db import get_engine
+from src.core.metrics import registry, token_revocation_checks
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings. The k bit positions come from one blake2b digest (double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class RevocationList:
+    """Denylist of revoked token ids (the jti claim).
+
+    Every authenticated request asks the in-memory bloom filter, which costs a few hashes and no I/O.
+    Only a filter hit, which may be a false positive, is confirmed against the revokedtokenmodel table,
+    and that answer is remembered until the next sync. The table is the durable copy: each worker rebuilds
+    its filter from it every sync interval, picking up other workers' revocations and forgetting expired ones.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.entries = 0
+        self._filter = BloomFilter(capacity, error_rate)
+        self._confirmed: dict[str, bool] = {}
+        # Revoked here since the current sync started, so a rebuild in progress cannot drop them.
+        self._recent: set[str] = set()
+
+    async def is_revoked(self, jti: str) -> bool:
+        if jti not in self._filter:
+            token_revocation_checks.inc("clear")
+            return False
+        revoked = self._confirmed.get(jti)
+        if revoked is None:
+            async with AsyncSession(get_engine()) as session:
+                revoked = await session.get(RevokedTokenModel, jti) is not None
+            self._confirmed[jti] = revoked
+        token_revocation_checks.inc("revoked" if revoked else "false_positive")
+        return revoked
+
+    async def revoke(self, session: AsyncSession, jti: str, expires_at: datetime) -> bool:
+        """Record the revocation; False if the id was already revoked (the primary key makes this race-free)."""
+        session.add(RevokedTokenModel(jti=jti, expires_at=expires_at))
+        try:
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            revoked = False
+        else:
+            revoked = True
+            self.entries += 1
+        self._filter.add(jti)
+        self._confirmed[jti] = True
+        self._recent.add(jti)
+        return revoked
+
+    async def sync(self):
+        """Purge expired rows and rebuild the filter from the table."""
+        self._recent = set()
+        async with AsyncSession(get_engine()) as session:
+            await session.exec(delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= datetime.utcnow()))
+            jtis = (await session.exec(select(RevokedTokenModel.jti))).all()
+            await session.commit()
+
+        # Grow past the configured capacity rather than let the false-positive rate climb.
+        rebuilt = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        revoked = set(jtis) | self._recent
+        for jti in revoked:
+            rebuilt.add(jti)
+        self._filter = rebuilt
+        self._confirmed = {}
+        self.entries = len(revoked)
+
+    async def run_sync(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.sync()
+            except SQLAlchemyError:
+                logger.exception("Revocation list sync failed; keeping the current filter")
+
+
+@lru_cache
+def get_revocation_list() -> RevocationList:
+    settings = get_settings()
+    return RevocationList(settings.revocation_bloom_capacity, settings.revocation_bloom_error_rate)
+
+
+registry.callback_gauge("token_revocation_entries", "Revoked token ids held in the denylist filter.", lambda: get_revocation_list().entries)
@@ -1,27 +1,58 @@
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.auth.db import get_session
-from src.auth.schemas import LoginReq, LoginResponse, RegisterReq, RegisterResponse
+from src.auth.dependencies import get_current_user
+from src.auth.schemas import LoginReq, LoginResponse, LogoutReq, RefreshReq, RegisterReq, RegisterResponse
 from src.auth.services import AuthService
+from src.core.db import get_session
+from src.core.security import PasswordHasherBusy
 
 auth_router = APIRouter(prefix="/auth", tags=["auth"])
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
+CurrentUser = Annotated[dict, Depends(get_current_user)]
+
+
+def _hasher_busy():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password operations in flight, retry shortly.",
+        headers={"Retry-After": "1"},
+    )
 
 
 @auth_router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(user_register_data: RegisterReq, session: SessionDep):
-    new_user = AuthService.register_user(user_register_data, session)
+    try:
+        new_user = await AuthService.register_user(user_register_data, session)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     return new_user
 
 
 @auth_router.post("/login", response_model=LoginResponse, status_code=status.HTTP_200_OK)
 async def login_user(user_login_data: LoginReq, session: SessionDep):
-    user_logged_in = AuthService.login_user(user_login_data, session)
+    try:
+        user_logged_in = await AuthService.login_user(user_login_data, session)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     if user_logged_in is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username or password")
 
     return user_logged_in
+
+
+@auth_router.post("/refresh", response_model=LoginResponse, status_code=status.HTTP_200_OK)
+async def refresh_tokens(refresh_data: RefreshReq, session: SessionDep):
+    tokens = await AuthService.refresh_tokens(refresh_data.refresh_token, session)
+    if tokens is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or revoked refresh token")
+
+    return tokens
+
+
+@auth_router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout_user(session: SessionDep, user: CurrentUser, logout_data: Optional[LogoutReq] = None):
+    await AuthService.logout_user(user, session, logout_data.refresh_token if logout_data else None)
@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -22,10 +23,19 @@ class RegisterResponse(BaseModel):
     email: str
 
 
+class RefreshReq(BaseModel):
+    refresh_token: str
+
+
+class LogoutReq(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str
 
 
 class LoginResponse(TokenResponse):
+    refresh_token: str
     username: str
@@ -1,23 +1,59 @@
+from datetime import datetime
+from typing import Optional
+
 from sqlmodel import select
 
 from src.auth.models import AuthModel
-from src.core.security import create_access_token, hash_password, verify_password
+from src.auth.revocation import get_revocation_list
+from src.core.security import create_access_token, create_refresh_token, get_password_hasher, verify_token
+
+
+def _issue_tokens(username: str):
+    return {
+        "access_token": create_access_token(data={"sub": username}),
+        "refresh_token": create_refresh_token(data={"sub": username}),
+        "token_type": "bearer",
+        "username": username,
+    }
+
+
+async def _revoke(payload: dict, session) -> bool:
+    return await get_revocation_list().revoke(session, payload["jti"], datetime.utcfromtimestamp(payload["exp"]))
 
 
 class AuthService:
     @staticmethod
-    def register_user(user_register_data, session):
-        hashed_password = hash_password(user_register_data.password)
+    async def register_user(user_register_data, session):
+        hashed_password = await get_password_hasher().hash(user_register_data.password)
         new_user = AuthModel(name=user_register_data.name, username=user_register_data.username, email=user_register_data.email, password=hashed_password)
         session.add(new_user)
-        session.commit()
-        session.refresh(new_user)
+        await session.commit()
+        await session.refresh(new_user)
         return new_user
 
     @staticmethod
-    def login_user(user_login_data, session):
-        user_exist = session.exec(select(AuthModel).where(AuthModel.username == user_login_data.username)).first()
-        if not user_exist or not verify_password(user_login_data.password, user_exist.password):
+    async def login_user(user_login_data, session):
+        user_exist = (await session.exec(select(AuthModel).where(AuthModel.username == user_login_data.username))).first()
+        if not user_exist or not await get_password_hasher().verify(user_login_data.password, user_exist.password):
             return None
-        access_token = create_access_token(data={"sub": user_exist.username})
-        return {"access_token": access_token, "token_type": "bearer", "username": user_exist.username}
+        return _issue_tokens(user_exist.username)
+
+    @staticmethod
+    async def refresh_tokens(refresh_token: str, session):
+        # No password check: the signed, unrevoked refresh token is the credential. It is single use (rotated on every call).
+        payload = verify_token(refresh_token)
+        if payload is None or payload.get("type") != "refresh" or "jti" not in payload:
+            return None
+        # Revoking first means two concurrent refreshes with the same token cannot both succeed.
+        if await get_revocation_list().is_revoked(payload["jti"]) or not await _revoke(payload, session):
+            return None
+        return _issue_tokens(payload["sub"])
+
+    @staticmethod
+    async def logout_user(access_payload: dict, session, refresh_token: Optional[str] = None):
+        if "jti" in access_payload:
+            await _revoke(access_payload, session)
+        if refresh_token is not None:
+            payload = verify_token(refresh_token)
+            if payload is not None and payload.get("type") == "refresh" and payload.get("sub") == access_payload.get("sub"):
+                await _revoke(payload, session)
@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Optional
+
+from src.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "clusters:changes"
+
+# Numbering and appending in one script keeps the stream ordered by seq however many workers publish at once.
+PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], seq .. '-0', 'event', ARGV[1])
+return seq
+"""
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.lagged = False
+
+
+class ChangeFeed:
+    """In-process feed of cluster writes with a replay buffer for resuming by sequence number.
+
+    Each subscriber gets a bounded queue. A subscriber that falls a full queue behind is cut off
+    (it receives a final "lagged" event and resumes with Last-Event-ID), so one slow consumer never
+    stalls writers or grows memory. Sequence numbers are per process; see RedisChangeFeed for one
+    sequence across workers.
+    """
+
+    def __init__(self, buffer_size: int, queue_size: int):
+        self.queue_size = queue_size
+        self._buffer: deque = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscriber] = set()
+        self._seq = 0
+
+    async def start(self):
+        pass
+
+    async def run(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def publish(self, event_type: str, **payload):
+        self._deliver({"seq": self._seq + 1, "type": event_type, "ts": time.time(), **payload})
+
+    def _deliver(self, event: dict):
+        self._seq = event["seq"]
+        self._buffer.append(event)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscriber.lagged = True
+                self._subscribers.discard(subscriber)
+
+    async def subscribe(self, since: Optional[int] = None, heartbeat: float = 15.0):
+        """Yield events after `since` (replayed from the buffer, then live), or None as a keep-alive tick."""
+        subscriber = Subscriber(self.queue_size)
+        # Register before replaying so nothing published during the replay is missed.
+        self._subscribers.add(subscriber)
+        last_seq = self._seq if since is None else since
+        try:
+            if since is not None:
+                oldest = self._buffer[0]["seq"] if self._buffer else self._seq + 1
+                if since + 1 < oldest or since > self._seq:
+                    # Events were evicted, or the id predates a restart: the client must re-sync from a full listing.
+                    last_seq = self._seq
+                    yield {"seq": last_seq, "type": "reset", "ts": time.time()}
+                for event in list(self._buffer):
+                    if event["seq"] > last_seq:
+                        last_seq = event["seq"]
+                        yield event
+
+            while True:
+                if subscriber.lagged and subscriber.queue.empty():
+                    yield {"seq": last_seq, "type": "lagged", "ts": time.time()}
+                    return
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event["seq"] > last_seq:
+                    last_seq = event["seq"]
+                    yield event
+        finally:
+            self._subscribers.discard(subscriber)
+
+
+def sse_message(event: Optional[dict]) -> str:
+    if event is None:
+        return ": keep-alive\n\n"
+    return f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+class RedisChangeFeed(ChangeFeed):
+    """Change feed shared by every worker through a Redis stream.
+
+    publish() appends to the stream under one global sequence instead of delivering locally. Each worker
+    runs a single reader (run()) that feeds the stream into the inherited buffer and subscriber queues, so
+    every worker streams every write, and a Last-Event-ID resume means the same thing on any worker.
+    """
+
+    def __init__(self, client, buffer_size: int, queue_size: int):
+        super().__init__(buffer_size, queue_size)
+        self.client = client
+        self._publish = client.register_script(PUBLISH_SCRIPT)
+        self._last_id = "0-0"
+        self._closing = False
+
+    async def start(self):
+        """Prefill the replay buffer from the stream, so resumes work from the moment this worker starts."""
+        entries = await self.client.xrevrange(STREAM_KEY, count=self._buffer.maxlen)
+        for entry_id, fields in reversed(entries):
+            self._deliver_entry(entry_id, fields)
+        if not entries:
+            self._seq = int(await self.client.get(f"{STREAM_KEY}:seq") or 0)
+            self._last_id = f"{self._seq}-0"
+
+    async def run(self):
+        from redis.exceptions import RedisError
+
+        while not self._closing:
+            try:
+                for _, entries in await self.client.xread({STREAM_KEY: self._last_id}, block=5000, count=500):
+                    for entry_id, fields in entries:
+                        self._deliver_entry(entry_id, fields)
+            except RedisError:
+                if self._closing:
+                    return
+                logger.exception("Change feed stream read failed; retrying")
+                await asyncio.sleep(1.0)
+
+    async def close(self):
+        """Stop the reader (its blocked read fails once the connection closes) and release the client."""
+        self._closing = True
+        await self.client.aclose()
+
+    async def publish(self, event_type: str, **payload):
+        from redis.exceptions import RedisError
+
+        event = json.dumps({"type": event_type, "ts": time.time(), **payload}, default=str)
+        try:
+            await self._publish(keys=[f"{STREAM_KEY}:seq", STREAM_KEY], args=[event, self._buffer.maxlen])
+        except RedisError:
+            # The write is already committed; failing the request would not undo it.
+            logger.exception("Could not publish %s change event", event_type)
+
+    def _deliver_entry(self, entry_id: str, fields: dict):
+        self._last_id = entry_id
+        self._deliver({"seq": int(entry_id.split("-")[0]), **json.loads(fields["event"])})
+
+
+@lru_cache
+def get_change_feed() -> ChangeFeed:
+    settings = get_settings()
+    if settings.change_feed_backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise RuntimeError("CHANGE_FEED_BACKEND=redis requires the 'redis' package") from exc
+        client = Redis.from_url(settings.redis_url, decode_responses=True)
+        return RedisChangeFeed(client, settings.change_feed_buffer_size, settings.change_feed_queue_size)
+    return ChangeFeed(settings.change_feed_buffer_size, settings.change_feed_queue_size)
@@ -0,0 +1,21 @@
+import csv
+import io
+import json
+
+EXPORT_COLUMNS = ("id", "name", "owner", "org", "is_active", "version")
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def ndjson_chunk(rows) -> str:
+    return "".join(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str) + "\n" for row in rows)
+
+
+def csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue()
+
+
+def csv_header() -> str:
+    return csv_chunk([EXPORT_COLUMNS])
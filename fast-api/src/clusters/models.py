@@ -1,11 +1,21 @@
 from uuid import UUID, uuid4
 
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, Index, SQLModel
 
 
 class ClusterModel(SQLModel, table=True):
+    # Composite indexes back the filtered keyset scans of the list endpoint (filter column, then name/id order).
+    # The Postgres-only trigram/prefix search indexes are created in migration d41f7a9b3c52.
+    __table_args__ = (
+        Index("ix_clustermodel_org_name", "org", "name", "id"),
+        Index("ix_clustermodel_owner_name", "owner", "name", "id"),
+        Index("ix_clustermodel_is_active_name", "is_active", "name", "id"),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     name: str = Field(index=True, unique=True)
     owner: str
     org: str
     is_active: bool = Field(default=False)
+    # Bumped on every write; feeds the resource ETag and If-Match checks.
+    version: int = Field(default=1, sa_column_kwargs={"server_default": "1"})
@@ -0,0 +1,21 @@
+import base64
+import json
+from uuid import UUID
+
+
+def encode_cursor(name: str, cluster_id: UUID) -> str:
+    raw = json.dumps([name, str(cluster_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded))
+        # Cursors are client input: anything but [name, id] strings would reach the keyset comparison or UUID() untyped.
+        if not (isinstance(value, list) and len(value) == 2 and all(isinstance(part, str) for part in value)):
+            raise ValueError("Malformed cursor")
+        name, cluster_id = value
+        return name, UUID(cluster_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Malformed cursor") from exc
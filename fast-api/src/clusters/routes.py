@@ -1,27 +1,117 @@
-from typing import Annotated
+from typing import Annotated, Any, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.dependencies import get_current_user
-from src.clusters.db import get_session
-from src.clusters.schemas import ClusterReq, ClusterResponse
-from src.clusters.service import ClusterService
+from src.clusters.events import get_change_feed, sse_message
+from src.clusters.export import MEDIA_TYPES, csv_chunk, csv_header, ndjson_chunk
+from src.clusters.schemas import BulkResult, ClusterPage, ClusterReq, ClusterResponse, ClusterStats
+from src.clusters.service import ClusterService, ClusterVersionConflict, cluster_etag, page_etag
+from src.core.config import get_settings
+from src.core.db import get_engine, get_session
+from src.core.etag import etag_matches
 
 cluster_router = APIRouter(prefix="/clusters", tags=["clusters"])
 
 
-SessionDep = Annotated[Session, Depends(get_session)]
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
 CurrentUser = Annotated[dict, Depends(get_current_user)]
+IfNoneMatch = Annotated[Optional[str], Header()]
+IfMatch = Annotated[Optional[str], Header()]
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BULK_ITEMS = 20_000
+MAX_SEARCH_RESULTS = 50
+
+"""
+Get the clusters available inside infra, one keyset page at a time.
+Pass the returned next_cursor back as ?cursor= to fetch the following page.
+"""
+
+
+@cluster_router.get("/", response_model=ClusterPage, status_code=status.HTTP_200_OK)
+async def get_root(
+    session: SessionDep,
+    if_none_match: IfNoneMatch = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    org: Optional[str] = None,
+    owner: Optional[str] = None,
+    is_active: Optional[bool] = None,
+):
+    try:
+        page = await ClusterService.get_all_clusters(session, limit=limit, cursor=cursor, org=org, owner=owner, is_active=is_active)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor.")
+
+    etag = page_etag(page)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    # Pages are built from ORM rows already dumped to response shape, so skip response_model re-validation.
+    return ORJSONResponse(page, headers={"ETag": etag})
+
+
+"""
+Cluster counts per org, per owner and active vs inactive, from one grouped query
+"""
+
+
+@cluster_router.get("/stats", response_model=ClusterStats, status_code=status.HTTP_200_OK)
+async def get_cluster_stats(session: SessionDep):
+    return ORJSONResponse(await ClusterService.get_cluster_stats(session))
+
+
+"""
+Typeahead search over cluster name, owner and org (name-prefix matches first)
+"""
+
+
+@cluster_router.get("/search", response_model=list[ClusterResponse], status_code=status.HTTP_200_OK)
+async def search_clusters(
+    session: SessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    field: Optional[Literal["name", "owner", "org"]] = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_SEARCH_RESULTS)] = 10,
+):
+    return ORJSONResponse(await ClusterService.search_clusters(q, session, field=field, limit=limit))
+
+
+"""
+Stream the full cluster inventory as NDJSON or CSV straight from a server-side cursor
+"""
+
+
+@cluster_router.get("/export", status_code=status.HTTP_200_OK)
+async def export_clusters(format: Literal["ndjson", "csv"] = "ndjson"):
+    async def body():
+        # The stream outlives the request handler, so it owns its session instead of using SessionDep.
+        async with AsyncSession(get_engine()) as session:
+            if format == "csv":
+                yield csv_header()
+            encode = csv_chunk if format == "csv" else ndjson_chunk
+            async for rows in ClusterService.stream_clusters(session):
+                yield encode(rows)
+
+    headers = {"Content-Disposition": f'attachment; filename="clusters.{format}"'}
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[format], headers=headers)
+
 
 """
-Get all the clusters available inside infra
+Push create/update/delete events as Server-Sent Events; reconnect with Last-Event-ID (or ?since=) to resume
 """
 
 
-@cluster_router.get("/", response_model=list[ClusterResponse], status_code=status.HTTP_200_OK)
-async def get_root(session: SessionDep):
-    return ClusterService.get_all_clusters(session)
+@cluster_router.get("/changes", status_code=status.HTTP_200_OK)
+async def stream_cluster_changes(since: Annotated[Optional[int], Query(ge=0)] = None, last_event_id: Annotated[Optional[int], Header(ge=0)] = None):
+    async def body():
+        async for event in get_change_feed().subscribe(since if since is not None else last_event_id, get_settings().change_feed_heartbeat_seconds):
+            yield sse_message(event)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(body(), media_type="text/event-stream", headers=headers)
 
 
 """
@@ -30,15 +120,18 @@ Get specific cluster available inside infra
 
 
 @cluster_router.get("/{cluster_name}", response_model=ClusterResponse, status_code=status.HTTP_200_OK)
-async def get_specific_cluster(cluster_name: str, session: SessionDep):
-    result = ClusterService.get_specific_cluster(cluster_name, session)
+async def get_specific_cluster(cluster_name: str, session: SessionDep, if_none_match: IfNoneMatch = None):
+    result = await ClusterService.get_specific_cluster(cluster_name, session)
 
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Given ID does not exist within existing records.",
         )
-    return result
+    etag = cluster_etag(result)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return ORJSONResponse(result, headers={"ETag": etag})
 
 
 """
@@ -48,7 +141,27 @@ Add new cluster entry to infra data
 
 @cluster_router.post("/", response_model=ClusterResponse, status_code=status.HTTP_201_CREATED)
 async def create_cluster_entry(clusterData: ClusterReq, session: SessionDep, current_user: CurrentUser):
-    return ClusterService.create_cluster_entry(clusterData, session)
+    return await ClusterService.create_cluster_entry(clusterData, session)
+
+
+"""
+Create or update many clusters (matched by name) in a single transaction; malformed items are reported per item and the rest are written
+"""
+
+
+@cluster_router.post("/bulk", response_model=BulkResult, status_code=status.HTTP_200_OK)
+async def bulk_upsert_clusters(clusters_data: Annotated[list[Any], Body(max_length=MAX_BULK_ITEMS)], session: SessionDep, current_user: CurrentUser):
+    return await ClusterService.bulk_upsert_clusters(clusters_data, session)
+
+
+"""
+Delete many clusters by name in a single transaction
+"""
+
+
+@cluster_router.post("/bulk/delete", response_model=BulkResult, status_code=status.HTTP_200_OK)
+async def bulk_delete_clusters(cluster_names: Annotated[list[str], Body(max_length=MAX_BULK_ITEMS)], session: SessionDep, current_user: CurrentUser):
+    return await ClusterService.bulk_delete_clusters(cluster_names, session)
 
 
 """
@@ -57,13 +170,22 @@ Update existing cluster with the new information inside infra data
 
 
 @cluster_router.put("/{cluster_name}", response_model=ClusterResponse, status_code=status.HTTP_200_OK)
-async def update_cluster(cluster_name: str, cluster_update_data: ClusterReq, session: SessionDep, current_user: CurrentUser):
-    result = ClusterService.update_cluster_entry(cluster_name, cluster_update_data, session)
+async def update_cluster(
+    cluster_name: str, cluster_update_data: ClusterReq, session: SessionDep, current_user: CurrentUser, response: Response, if_match: IfMatch = None
+):
+    try:
+        result = await ClusterService.update_cluster_entry(cluster_name, cluster_update_data, session, if_match=if_match)
+    except ClusterVersionConflict:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Cluster was modified since the given ETag was issued.",
+        )
     if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Given ID does not exist within existing records.",
         )
+    response.headers["ETag"] = cluster_etag(result)
     return result
 
 
@@ -74,7 +196,7 @@ Delete the specific entry from the infra list
 
 @cluster_router.delete("/{cluster_name}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_cluster(cluster_name: str, session: SessionDep, current_user: CurrentUser):
-    result = ClusterService.delete_cluster_entry(cluster_name, session)
+    result = await ClusterService.delete_cluster_entry(cluster_name, session)
     if not result:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
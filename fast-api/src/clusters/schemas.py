@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -16,3 +17,36 @@ class ClusterResponse(BaseModel):
     owner: str
     org: str
     is_active: bool
+    version: int
+
+
+class ClusterPage(BaseModel):
+    items: list[ClusterResponse]
+    next_cursor: Optional[str] = None
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    name: Optional[str] = None
+    status: str
+    id: Optional[UUID] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class GroupCount(BaseModel):
+    total: int
+    active: int
+
+
+class ClusterStats(BaseModel):
+    total: int
+    active: int
+    inactive: int
+    per_org: dict[str, GroupCount]
+    per_owner: dict[str, GroupCount]
@@ -1,44 +1,320 @@
-from sqlmodel import Session, select
+import importlib
+import json
+from typing import Any, Optional
+from uuid import uuid4
 
+from pydantic import ValidationError
+from sqlmodel import case, col, delete, func, or_, select, tuple_, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.clusters.events import get_change_feed
+from src.clusters.export import EXPORT_COLUMNS
 from src.clusters.models import ClusterModel
+from src.clusters.pagination import decode_cursor, encode_cursor
 from src.clusters.schemas import ClusterReq
+from src.core.cache import get_cache
+from src.core.etag import etag_matches, make_etag
+from src.core.singleflight import SingleFlight
+
+# Rows per statement; keeps each multi-row INSERT well under Postgres' 65535 bind-parameter cap.
+BULK_CHUNK_SIZE = 1000
+# Rows fetched per round trip from the server-side cursor during export.
+EXPORT_BATCH_SIZE = 1000
+
+# Imported on first bulk upsert; the dialect packages are a noticeable share of startup import time.
+_UPSERT_DIALECTS = {"postgresql": "sqlalchemy.dialects.postgresql", "sqlite": "sqlalchemy.dialects.sqlite"}
+
+LIST_CACHE_NAMESPACE = "clusters:list"
+
+cluster_reads = SingleFlight("clusters")
+
+SEARCH_FIELDS = ("name", "owner", "org")
+# Below this length trigram indexes cannot help, so search is a prefix lookup only.
+SEARCH_MIN_SUBSTRING_LENGTH = 3
+
+
+class ClusterVersionConflict(Exception):
+    """The If-Match precondition of an update no longer matches the stored row."""
+
+
+def cluster_etag(cluster) -> str:
+    if not isinstance(cluster, dict):
+        cluster = cluster.model_dump(mode="json")
+    return make_etag(cluster["id"], cluster["version"])
+
+
+def page_etag(page: dict) -> str:
+    return make_etag([(item["id"], item["version"]) for item in page["items"]], page["next_cursor"])
+
+
+def _cluster_namespace(cluster_name: str) -> str:
+    return f"clusters:name:{cluster_name}"
+
+
+def _cluster_cache_key(cluster_name: str, generation: int) -> str:
+    return f"{_cluster_namespace(cluster_name)}:{generation}"
+
+
+async def _invalidate_clusters(*cluster_names: str):
+    """Retire every cached list page and stats snapshot, and the single-cluster entries of the written names.
+
+    Single clusters are keyed by a per-name generation rather than deleted: a read that loaded the row before
+    the write then stores it under a key no later read looks up, instead of re-filling the live key with the
+    old row. Other names keep their entries.
+    """
+    await get_cache().bump_generation(LIST_CACHE_NAMESPACE, *(_cluster_namespace(name) for name in set(cluster_names)))
+
+
+def _chunks(items: list, size: int = BULK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _validate_items(items: list[Any]):
+    """Return ({index: ClusterReq} for the valid items, per-item errors for the rest)."""
+    valid, errors = {}, []
+    for index, item in enumerate(items):
+        try:
+            valid[index] = ClusterReq.model_validate(item)
+        except ValidationError as exc:
+            name = item.get("name") if isinstance(item, dict) and isinstance(item.get("name"), str) else None
+            message = "; ".join(f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors())
+            errors.append({"index": index, "name": name, "status": "error", "error": message})
+    return valid, errors
+
+
+def _split_duplicates(indexed_names):
+    """Return (indexes to write, per-item errors) keeping the first occurrence of each name, from (index, name) pairs."""
+    seen = set()
+    keep, errors = [], []
+    for index, name in indexed_names:
+        if name in seen:
+            errors.append({"index": index, "name": name, "status": "error", "error": "Duplicate name within batch."})
+            continue
+        seen.add(name)
+        keep.append(index)
+    return keep, errors
+
+
+def _bulk_result(results: list[dict]):
+    results.sort(key=lambda item: item["index"])
+    failed = sum(1 for item in results if item["status"] == "error")
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
 
 
 class ClusterService:
     @staticmethod
-    def get_all_clusters(session: Session):
-        clusters = session.exec(select(ClusterModel)).all()
-        return clusters
+    async def get_all_clusters(
+        session: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        org: Optional[str] = None,
+        owner: Optional[str] = None,
+        is_active: Optional[bool] = None,
+    ):
+        generation = await get_cache().generation(LIST_CACHE_NAMESPACE)
+        cache_key = f"{LIST_CACHE_NAMESPACE}:{generation}:" + json.dumps([limit, cursor, org, owner, is_active])
+        page = await get_cache().get(cache_key)
+        if page is not None:
+            return page
+
+        async def load():
+            statement = select(ClusterModel)
+            if org is not None:
+                statement = statement.where(ClusterModel.org == org)
+            if owner is not None:
+                statement = statement.where(ClusterModel.owner == owner)
+            if is_active is not None:
+                statement = statement.where(ClusterModel.is_active == is_active)
+            if cursor is not None:
+                statement = statement.where(tuple_(ClusterModel.name, ClusterModel.id) > tuple_(*decode_cursor(cursor)))
+            # Fetch one extra row to know whether another page exists without a COUNT(*).
+            statement = statement.order_by(ClusterModel.name, ClusterModel.id).limit(limit + 1)
+            clusters = (await session.exec(statement)).all()
+
+            next_cursor = None
+            if len(clusters) > limit:
+                clusters = clusters[:limit]
+                next_cursor = encode_cursor(clusters[-1].name, clusters[-1].id)
+            page = {"items": [cluster.model_dump(mode="json") for cluster in clusters], "next_cursor": next_cursor}
+            await get_cache().set(cache_key, page)
+            return page
+
+        # Identical concurrent misses share one query instead of each opening their own.
+        return await cluster_reads.do(cache_key, load)
 
     @staticmethod
-    def get_specific_cluster(cluster_name: str, session: Session):
-        cluster = session.exec(select(ClusterModel).where(ClusterModel.name == cluster_name)).first()
-        return cluster
+    async def stream_clusters(session: AsyncSession):
+        """Yield batches of plain export rows from a server-side cursor, never holding more than one batch."""
+        statement = select(*(getattr(ClusterModel, column) for column in EXPORT_COLUMNS)).order_by(ClusterModel.name)
+        result = await session.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield rows
+
+    @staticmethod
+    async def get_cluster_stats(session: AsyncSession):
+        # Materialized under the list generation, so any write retires it and reads cost O(groups) until then.
+        generation = await get_cache().generation(LIST_CACHE_NAMESPACE)
+        cache_key = f"{LIST_CACHE_NAMESPACE}:{generation}:stats"
+        stats = await get_cache().get(cache_key)
+        if stats is not None:
+            return stats
+
+        statement = select(ClusterModel.org, ClusterModel.owner, ClusterModel.is_active, func.count()).group_by(
+            ClusterModel.org, ClusterModel.owner, ClusterModel.is_active
+        )
+        stats = {"total": 0, "active": 0, "inactive": 0, "per_org": {}, "per_owner": {}}
+        for org, owner, is_active, count in (await session.exec(statement)).all():
+            active = count if is_active else 0
+            stats["total"] += count
+            stats["active"] += active
+            for bucket, key in ((stats["per_org"], org), (stats["per_owner"], owner)):
+                group = bucket.setdefault(key, {"total": 0, "active": 0})
+                group["total"] += count
+                group["active"] += active
+        stats["inactive"] = stats["total"] - stats["active"]
+        await get_cache().set(cache_key, stats)
+        return stats
+
+    @staticmethod
+    async def search_clusters(query: str, session: AsyncSession, field: Optional[str] = None, limit: int = 10):
+        term = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        name = func.lower(ClusterModel.name)
+        columns = [func.lower(col(getattr(ClusterModel, column))) for column in ((field,) if field else SEARCH_FIELDS)]
+        if len(query) < SEARCH_MIN_SUBSTRING_LENGTH:
+            # Prefix of the requested field, or of name when searching every field.
+            condition = columns[0].like(f"{term}%", escape="\\")
+        else:
+            condition = or_(*(column.like(f"%{term}%", escape="\\") for column in columns))
+        # Name-prefix matches rank first, as a typeahead user expects.
+        rank = case((name.like(f"{term}%", escape="\\"), 0), else_=1)
+        statement = select(ClusterModel).where(condition).order_by(rank, ClusterModel.name).limit(limit)
+        clusters = (await session.exec(statement)).all()
+        return [cluster.model_dump(mode="json") for cluster in clusters]
+
+    @staticmethod
+    async def get_specific_cluster(cluster_name: str, session: AsyncSession):
+        # Writes to this name bump its generation before they return, so a read that starts after a write never sees
+        # an entry or joins a flight from before it.
+        generation = await get_cache().generation(_cluster_namespace(cluster_name))
+        cache_key = _cluster_cache_key(cluster_name, generation)
+        cached = await get_cache().get(cache_key)
+        if cached is not None:
+            return cached
+
+        async def load():
+            cluster = (await session.exec(select(ClusterModel).where(ClusterModel.name == cluster_name))).first()
+            if cluster is None:
+                return None
+            cluster_data = cluster.model_dump(mode="json")
+            await get_cache().set(cache_key, cluster_data)
+            return cluster_data
+
+        return await cluster_reads.do(cache_key, load)
 
     @staticmethod
-    def create_cluster_entry(clusterRequest: ClusterReq, session: Session):
+    async def create_cluster_entry(clusterRequest: ClusterReq, session: AsyncSession):
         new_cluster = ClusterModel(**clusterRequest.model_dump())
         session.add(new_cluster)
-        session.commit()
-        session.refresh(new_cluster)
+        await session.commit()
+        await session.refresh(new_cluster)
+        await _invalidate_clusters(new_cluster.name)
+        await get_change_feed().publish("created", name=new_cluster.name, cluster=new_cluster.model_dump(mode="json"))
         return new_cluster
 
     @staticmethod
-    def update_cluster_entry(cluster_name: str, cluster_update_data: ClusterReq, session: Session):
-        cluster = session.exec(select(ClusterModel).where(ClusterModel.name == cluster_name)).first()
-        if not cluster:
+    async def update_cluster_entry(cluster_name: str, cluster_update_data: ClusterReq, session: AsyncSession, if_match: Optional[str] = None):
+        statement = (
+            update(ClusterModel)
+            .where(ClusterModel.name == cluster_name)
+            .values(**cluster_update_data.model_dump(), version=ClusterModel.version + 1)
+            .returning(ClusterModel)
+            .execution_options(synchronize_session=False)
+        )
+        if if_match is not None and if_match.strip() != "*":
+            # An ETag cannot be compared in SQL, so resolve it to a version and let the UPDATE guard on that.
+            current = (await session.exec(select(ClusterModel.id, ClusterModel.version).where(ClusterModel.name == cluster_name))).first()
+            if current is None:
+                return None
+            if not etag_matches(if_match, cluster_etag({"id": current.id, "version": current.version}), weak=False):
+                raise ClusterVersionConflict(cluster_name)
+            statement = statement.where(ClusterModel.version == current.version)
+
+        cluster = (await session.exec(statement)).scalars().first()
+        # Dumped before the commit: with expire_on_commit the RETURNING entity would otherwise lazy-load outside a greenlet.
+        cluster_data = None if cluster is None else cluster.model_dump(mode="json")
+        await session.commit()
+        if cluster_data is None:
+            if if_match is not None and if_match.strip() != "*":
+                raise ClusterVersionConflict(cluster_name)
             return None
-        for key, value in cluster_update_data.model_dump().items():
-            setattr(cluster, key, value)
-        session.commit()
-        session.refresh(cluster)
-        return cluster
+        await _invalidate_clusters(cluster_data["name"], cluster_name)
+        await get_change_feed().publish("updated", name=cluster_data["name"], previous_name=cluster_name, cluster=cluster_data)
+        return cluster_data
 
     @staticmethod
-    def delete_cluster_entry(cluster_name: str, session: Session):
-        cluster = session.exec(select(ClusterModel).where(ClusterModel.name == cluster_name)).first()
-        if not cluster:
+    async def delete_cluster_entry(cluster_name: str, session: AsyncSession):
+        statement = delete(ClusterModel).where(ClusterModel.name == cluster_name).returning(ClusterModel.id)
+        deleted_id = (await session.exec(statement)).first()
+        await session.commit()
+        if deleted_id is None:
             return False
-        session.delete(cluster)
-        session.commit()
+        await _invalidate_clusters(cluster_name)
+        await get_change_feed().publish("deleted", name=cluster_name)
         return True
+
+    @staticmethod
+    async def bulk_upsert_clusters(items: list[Any], session: AsyncSession):
+        """Items are validated one by one, so a malformed item is reported in its result instead of rejecting the batch."""
+        insert = importlib.import_module(_UPSERT_DIALECTS[session.bind.dialect.name]).insert
+        cluster_requests, invalid = _validate_items(items)
+        keep, results = _split_duplicates((index, request.name) for index, request in cluster_requests.items())
+        results.extend(invalid)
+
+        for chunk in _chunks(keep):
+            rows = [cluster_requests[index].model_dump() for index in chunk]
+            names = [row["name"] for row in rows]
+            existing = set((await session.exec(select(ClusterModel.name).where(ClusterModel.name.in_(names)))).all())
+
+            for row in rows:
+                row["id"] = uuid4()
+                row["version"] = 1
+            statement = insert(ClusterModel).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[ClusterModel.name],
+                set_={**{column: statement.excluded[column] for column in ("owner", "org", "is_active")}, "version": ClusterModel.version + 1},
+            ).returning(ClusterModel.name, ClusterModel.id)
+            ids = {name: cluster_id for name, cluster_id in (await session.exec(statement)).all()}
+
+            for index, name in zip(chunk, names):
+                results.append({"index": index, "name": name, "status": "updated" if name in existing else "created", "id": ids[name]})
+
+        await session.commit()
+        written = [item["name"] for item in results if item["status"] != "error"]
+        # A batch that wrote nothing leaves the cache and change-feed subscribers alone.
+        if written:
+            await _invalidate_clusters(*written)
+            await get_change_feed().publish("bulk_upserted", names=written)
+        return _bulk_result(results)
+
+    @staticmethod
+    async def bulk_delete_clusters(cluster_names: list[str], session: AsyncSession):
+        keep, results = _split_duplicates(enumerate(cluster_names))
+
+        for chunk in _chunks(keep):
+            names = [cluster_names[index] for index in chunk]
+            statement = delete(ClusterModel).where(ClusterModel.name.in_(names)).returning(ClusterModel.name, ClusterModel.id)
+            ids = {name: cluster_id for name, cluster_id in (await session.exec(statement)).all()}
+
+            for index, name in zip(chunk, names):
+                if name in ids:
+                    results.append({"index": index, "name": name, "status": "deleted", "id": ids[name]})
+                else:
+                    results.append({"index": index, "name": name, "status": "error", "error": "Given name does not exist within existing records."})
+
+        await session.commit()
+        deleted = [item["name"] for item in results if item["status"] != "error"]
+        if deleted:
+            await _invalidate_clusters(*deleted)
+            await get_change_feed().publish("bulk_deleted", names=deleted)
+        return _bulk_result(results)
@@ -0,0 +1,130 @@
+import json
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from src.core.config import get_settings
+from src.core.metrics import registry
+
+
+class MemoryCacheBackend:
+    """In-process LRU with per-entry expiry. Generation counters live outside the LRU so they are never evicted."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self):
+        self._entries.clear()
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, *keys: str):
+        for key in keys:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+
+class RedisCacheBackend:
+    """Backend for any client exposing the redis.asyncio get/set/incr/pipeline API (Redis, Valkey, fakeredis)."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await self.client.set(key, json.dumps(value), px=int(ttl * 1000))
+
+    async def counter(self, key: str) -> int:
+        raw = await self.client.get(key)
+        return 0 if raw is None else int(raw)
+
+    async def incr(self, *keys: str):
+        # One round trip however many counters a bulk write touches.
+        async with self.client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+
+
+class Cache:
+    def __init__(self, backend, ttl: float, enabled: bool = True):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any):
+        if self.enabled:
+            await self.backend.set(key, value, self.ttl)
+
+    # Generations are tracked even with caching off: single-flight keys include them, so a read never joins a pre-write flight.
+    async def generation(self, namespace: str) -> int:
+        return await self.backend.counter(f"{namespace}:generation")
+
+    async def bump_generation(self, *namespaces: str):
+        # Keys built from the previous generation become unreachable and age out through LRU/TTL.
+        if self.enabled:
+            self.invalidations += len(namespaces)
+        await self.backend.incr(*(f"{namespace}:generation" for namespace in namespaces))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": get_settings().cache_backend,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+
+@lru_cache
+def get_cache() -> Cache:
+    settings = get_settings()
+    if settings.cache_backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package") from exc
+        return Cache(RedisCacheBackend(Redis.from_url(settings.redis_url)), settings.cache_ttl_seconds)
+    backend = MemoryCacheBackend(settings.cache_max_entries)
+    return Cache(backend, settings.cache_ttl_seconds, enabled=settings.cache_backend != "none")
+
+
+registry.callback_gauge("cache_hits_total", "Read-through cache hits.", lambda: get_cache().hits, kind="counter")
+registry.callback_gauge("cache_misses_total", "Read-through cache misses.", lambda: get_cache().misses, kind="counter")
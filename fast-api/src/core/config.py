@@ -1,15 +1,100 @@
+from functools import lru_cache
+from typing import Literal, Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
 class Settings(BaseSettings):
     database_url: str
     secret_key: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    refresh_token_expire_days: int = 7
     mcp_base_url: str = "http://localhost:8000/api/v1"
+    # http: call the API at mcp_base_url. asgi: call main.app in-process over ASGI. direct: call the services, no HTTP or JSON round trip.
+    mcp_transport: Literal["http", "asgi", "direct"] = "http"
+    # One pooled client per MCP server process; HTTP/2 is negotiated over TLS, plain http stays on keep-alive HTTP/1.1.
+    mcp_http2: bool = True
+    mcp_max_connections: int = 20
+    mcp_max_keepalive_connections: int = 10
+    mcp_keepalive_expiry: float = 30.0
+    mcp_connect_timeout: float = 5.0
+    mcp_timeout: float = 30.0
+    # Resource reads are served from memory for the TTL, then revalidated with If-None-Match; 0 revalidates every read.
+    mcp_cache_ttl_seconds: float = 30.0
+    mcp_cache_max_entries: int = 1024
+    mcp_cache_revalidate: bool = True
+    # Follow the API's change feed to drop changed entries early and notify subscribed MCP clients.
+    mcp_watch_changes: bool = True
+
+    # One pool is shared by every router; size it as replicas * (pool_size + max_overflow) <= server max_connections.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: Optional[int] = None
+
+    cache_backend: Literal["memory", "redis", "none"] = "memory"
+    cache_ttl_seconds: float = 30.0
+    cache_max_entries: int = 10_000
+    redis_url: str = "redis://localhost:6379/0"
+
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 32
+    token_cache_max_entries: int = 4096
+
+    # Revoked token ids: sized for the expected number of live revocations; other workers see a revocation within one sync interval.
+    revocation_bloom_capacity: int = 100_000
+    revocation_bloom_error_rate: float = 0.001
+    revocation_sync_seconds: float = 30.0
+
+    # memory: one feed per process. redis: one stream and sequence shared by every worker (uses redis_url).
+    change_feed_backend: Literal["memory", "redis"] = "memory"
+    change_feed_buffer_size: int = 10_000
+    change_feed_queue_size: int = 1000
+    change_feed_heartbeat_seconds: float = 15.0
+
+    # Set by gunicorn.conf.py; more than one worker needs the cache and change feed shared between them.
+    web_concurrency: int = 1
 
     class Config:
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def shared_state_for_workers(self):
+        if self.web_concurrency > 1:
+            # Per-worker memory would serve stale rows after another worker's write, and split the change feed.
+            if "cache_backend" not in self.model_fields_set:
+                self.cache_backend = "redis"
+            if "change_feed_backend" not in self.model_fields_set:
+                self.change_feed_backend = "redis"
+            if self.cache_backend == "memory" or self.change_feed_backend == "memory":
+                raise ValueError(
+                    f"WEB_CONCURRENCY={self.web_concurrency} needs state shared between workers: "
+                    "use CACHE_BACKEND=redis (or none) and CHANGE_FEED_BACKEND=redis, or run a single worker"
+                )
+        return self
+
+    @property
+    def async_database_url(self) -> str:
+        # Alembic keeps using the sync URL; the API swaps in the matching async driver.
+        from sqlalchemy.engine import make_url
+
+        url = make_url(self.database_url)
+        backend = url.get_backend_name()
+        if backend in ASYNC_DRIVERS and url.drivername != ASYNC_DRIVERS[backend]:
+            url = url.set(drivername=ASYNC_DRIVERS[backend])
+        return url.render_as_string(hide_password=False)
+
 
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """Read the environment on first use rather than at import, so importing src costs no env parsing."""
+    return Settings()
@@ -0,0 +1,113 @@
+import asyncio
+import time
+from functools import lru_cache
+
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import get_settings
+from src.core.metrics import instrument_engine, registry
+
+
+class PoolStats:
+    """Running totals of connection checkouts, used to size the pool per replica."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float):
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        if waited > self.wait_seconds_max:
+            self.wait_seconds_max = waited
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.record(time.perf_counter() - start)
+
+
+def _connect_args(settings) -> dict:
+    if settings.db_statement_timeout_ms and make_url(settings.database_url).get_backend_name() == "postgresql":
+        return {"server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)}}
+    return {}
+
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    """The single shared engine, built on first use so imports (Alembic, CLIs, tooling) never load a DB driver."""
+    settings = get_settings()
+    engine = create_async_engine(
+        settings.async_database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=_connect_args(settings),
+    )
+    instrument_engine(engine)
+    return engine
+
+
+registry.callback_gauge("db_pool_size", "Configured pool size.", lambda: get_engine().pool.size())
+registry.callback_gauge("db_pool_checked_out", "Connections currently checked out.", lambda: get_engine().pool.checkedout())
+registry.callback_gauge("db_pool_overflow", "Overflow connections currently open.", lambda: get_engine().pool.overflow())
+registry.callback_gauge("db_pool_checkouts_total", "Connection checkouts.", lambda: pool_stats.checkouts, kind="counter")
+registry.callback_gauge("db_pool_timeouts_total", "Checkouts that timed out waiting.", lambda: pool_stats.timeouts, kind="counter")
+registry.callback_gauge("db_pool_wait_seconds_total", "Time spent acquiring connections.", lambda: pool_stats.wait_seconds_total, kind="counter")
+
+
+async def create_db_and_table():
+    async with get_engine().begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+
+
+async def warm_pool():
+    """Open pool_size connections up front so no request pays for a connection handshake."""
+
+    engine = get_engine()
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    # Concurrent checkouts force distinct connections; they stay in the pool once returned.
+    await asyncio.gather(*(ping() for _ in range(engine.pool.size())))
+
+
+async def get_session():
+    async with AsyncSession(get_engine(), expire_on_commit=False) as session:
+        yield session
+
+
+def pool_metrics() -> dict:
+    pool = get_engine().pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_seconds_total": round(pool_stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(pool_stats.wait_seconds_max, 6),
+    }
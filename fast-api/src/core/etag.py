@@ -0,0 +1,20 @@
+import hashlib
+import json
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(json.dumps(parts, separators=(",", ":"), default=str).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    """Evaluate an If-None-Match (weak comparison) or If-Match (weak=False) header against a strong ETag."""
+    if header is None:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    if "*" in candidates:
+        return True
+    if weak:
+        candidates = [candidate.removeprefix("W/") for candidate in candidates]
+    return etag in candidates
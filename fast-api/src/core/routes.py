@@ -0,0 +1,38 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from src.core.cache import get_cache
+from src.core.db import pool_metrics
+from src.core.metrics import registry
+
+ops_router = APIRouter(prefix="/ops", tags=["ops"])
+metrics_router = APIRouter(tags=["ops"])
+
+"""
+Connection pool usage for this process, to size the pool against the replica count
+"""
+
+
+@ops_router.get("/pool", status_code=status.HTTP_200_OK)
+async def get_pool_metrics():
+    return pool_metrics()
+
+
+"""
+Hit/miss counters of the read-through cache in front of cluster lookups
+"""
+
+
+@ops_router.get("/cache", status_code=status.HTTP_200_OK)
+async def get_cache_metrics():
+    return get_cache().stats()
+
+
+"""
+Prometheus text exposition of request, DB, pool, cache, bcrypt and JWT metrics
+"""
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse, status_code=status.HTTP_200_OK)
+async def get_metrics():
+    return registry.render()
@@ -1,31 +1,110 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from uuid import uuid4
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from src.core.config import get_settings
+from src.core.metrics import password_hash_duration
 
-from src.core.config import settings
+# passlib and python-jose (which pulls in cryptography) are imported on first use; together they are most of this module's import time.
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(password, hashed_password)
+    return _pwd_context().verify(password, hashed_password)
 
 
-def create_access_token(data: dict) -> str:
+def _timed(fn, *args):
+    # Timed inside the worker so queue wait is excluded; the caller records it on the event loop.
+    start = time.perf_counter()
+    return fn(*args), time.perf_counter() - start
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; callers should shed load instead of waiting."""
+
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL while it works, so threads give real parallelism here.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._workers = workers
+        self._capacity = workers + queue_limit
+        self._pending = 0
+
+    async def _run(self, operation: str, fn, *args):
+        if self._pending >= self._capacity:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            result, elapsed = await asyncio.get_running_loop().run_in_executor(self._executor, _timed, fn, *args)
+        finally:
+            self._pending -= 1
+        password_hash_duration.observe(elapsed, operation)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run("verify", verify_password, password, hashed_password)
+
+    async def warm_up(self):
+        """Start every worker thread and load passlib's bcrypt backend before the first login needs them."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, hash_password, "warm-up") for _ in range(self._workers)))
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+@lru_cache
+def get_password_hasher() -> PasswordHasher:
+    settings = get_settings()
+    return PasswordHasher(settings.password_hash_workers, settings.password_hash_queue_limit)
+
+
+def _create_token(data: dict, token_type: str, expires_in: timedelta) -> str:
+    from jose import jwt
+
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
-    to_encode.update({"exp": expire})
+    expire = datetime.utcnow() + expires_in
+    # jti identifies the token for revocation; type keeps refresh tokens out of the bearer path and vice versa.
+    to_encode.update({"exp": expire, "jti": uuid4().hex, "type": token_type})
+    settings = get_settings()
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
 
+def create_access_token(data: dict) -> str:
+    return _create_token(data, "access", timedelta(minutes=get_settings().access_token_expire_minutes))
+
+
+def create_refresh_token(data: dict) -> str:
+    return _create_token(data, "refresh", timedelta(days=get_settings().refresh_token_expire_days))
+
+
 def verify_token(token: str) -> dict:
+    from jose import JWTError, jwt
+
     try:
+        settings = get_settings()
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         return payload
     except JWTError:
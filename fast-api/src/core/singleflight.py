@@ -0,0 +1,49 @@
+import asyncio
+
+from src.core.metrics import registry
+
+coalesced_calls = registry.counter("single_flight_coalesced_total", "Calls served by joining an identical in-flight call.", ("namespace",))
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution whose result every caller shares.
+
+    The first caller (the leader) runs the call inline, on its own request's session. Followers wait on a
+    shielded future; if the leader is cancelled (client went away) a follower takes over as the new leader.
+    Results are shared, so callers must treat them as read-only.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn):
+        while True:
+            flight = self._inflight.get(key)
+            if flight is None:
+                break
+            coalesced_calls.inc(self.namespace)
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # The leader was cancelled, not us: retry, possibly as the new leader.
+
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = flight
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exc:
+            flight.set_exception(exc)
+            # Mark retrieved so a flight without followers does not log "exception never retrieved".
+            flight.exception()
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
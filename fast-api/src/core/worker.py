@@ -0,0 +1,14 @@
+from uvicorn_worker import UvicornWorker
+
+
+class AppWorker(UvicornWorker):
+    """Uvicorn worker that drains within gunicorn's graceful_timeout and never serves without its lifespan."""
+
+    # "auto" would log a failed warm-up and serve anyway; "on" makes it a boot error so gunicorn retries the worker.
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, "lifespan": "on"}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Stop waiting on in-flight requests (long SSE streams included) a little before gunicorn would SIGKILL us,
+        # so lifespan shutdown still gets to close the pool cleanly.
+        self.config.timeout_graceful_shutdown = max(1, self.cfg.graceful_timeout - 5)
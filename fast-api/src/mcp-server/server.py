@@ -1,12 +1,361 @@
+import asyncio
+import logging
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager, suppress
+from functools import lru_cache
+from typing import Annotated, Literal, NamedTuple, Optional, Union
+from urllib.parse import quote
+
+import anyio
 import httpx
+import orjson
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from mcp.server.lowlevel import NotificationOptions
+from pydantic import AnyUrl, Field
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.schemas import RegisterReq, RegisterResponse
+from src.auth.services import AuthService
+from src.clusters.service import ClusterService, cluster_etag, page_etag
+from src.core.config import get_settings
+from src.core.db import get_engine
+from src.core.singleflight import SingleFlight
 
-from src.auth.schemas import RegisterReq
-from src.core.config import settings
+logger = logging.getLogger(__name__)
 
 mcp = FastMCP("Cluster Resource Management MCP Server", port=8001)
 
-BASE_URL = settings.mcp_base_url
+CLUSTER_LIST_URI = "clusters://"
+CLUSTER_SUMMARY_URI = "clusters://summary"
+
+# Kept well below the API's own caps: every row returned is context the agent has to read.
+MAX_TOOL_PAGE_SIZE = 100
+MAX_TOOL_SEARCH_RESULTS = 50
+
+
+def _session() -> AsyncSession:
+    return AsyncSession(get_engine(), expire_on_commit=False)
+
+
+def _json(data) -> str:
+    return orjson.dumps(data).decode()
+
+
+def _cluster_uri(name: str) -> str:
+    return f"clusters://{name}"
+
+
+class Read(NamedTuple):
+    """A resource body and its ETag. text is None when the API answered 304 to the ETag that was sent."""
+
+    text: Optional[str]
+    etag: Optional[str] = None
+
+
+class ApiBackend:
+    """Talks to the cluster API over HTTP, either remotely (transport "http") or to main.app in-process over ASGI ("asgi")."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def register_user(self, user_data: RegisterReq) -> dict:
+        response = await self.client.post("/auth/register", json=user_data.model_dump())
+        return response.json()
+
+    async def _read(self, path: str, etag: Optional[str]) -> Optional[Read]:
+        response = await self.client.get(path, headers={"If-None-Match": etag} if etag else None)
+        if response.status_code == 304:
+            return Read(None, etag)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return Read(response.text, response.headers.get("ETag"))
+
+    async def get_all_clusters(self, etag: Optional[str] = None) -> Read:
+        return await self._read("/clusters/", etag)
+
+    async def get_cluster(self, name: str, etag: Optional[str] = None) -> Optional[Read]:
+        return await self._read(f"/clusters/{quote(name, safe='')}", etag)
+
+    async def get_cluster_stats(self, etag: Optional[str] = None) -> Read:
+        return await self._read("/clusters/stats", etag)
+
+    async def list_clusters(self, **filters) -> dict:
+        response = await self.client.get("/clusters/", params={key: value for key, value in filters.items() if value is not None})
+        response.raise_for_status()
+        return response.json()
+
+    async def search_clusters(self, query: str, field: Optional[str], limit: int) -> list:
+        params = {"q": query, "limit": limit, **({"field": field} if field else {})}
+        response = await self.client.get("/clusters/search", params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class ServiceBackend:
+    """Calls AuthService and ClusterService directly on the shared engine ("direct"): no HTTP and no JSON decode/re-encode."""
+
+    async def register_user(self, user_data: RegisterReq) -> dict:
+        async with _session() as session:
+            new_user = await AuthService.register_user(user_data, session)
+        return RegisterResponse.model_validate(new_user, from_attributes=True).model_dump(mode="json")
+
+    # A conditional read would cost the same service call as a full one, so the etag argument is not used.
+    async def get_all_clusters(self, etag: Optional[str] = None) -> Read:
+        async with _session() as session:
+            page = await ClusterService.get_all_clusters(session)
+        return Read(_json(page), page_etag(page))
+
+    async def get_cluster(self, name: str, etag: Optional[str] = None) -> Optional[Read]:
+        async with _session() as session:
+            cluster = await ClusterService.get_specific_cluster(name, session)
+        return None if cluster is None else Read(_json(cluster), cluster_etag(cluster))
+
+    async def get_cluster_stats(self, etag: Optional[str] = None) -> Read:
+        async with _session() as session:
+            return Read(_json(await ClusterService.get_cluster_stats(session)))
+
+    async def list_clusters(self, **filters) -> dict:
+        async with _session() as session:
+            return await ClusterService.get_all_clusters(session, **filters)
+
+    async def search_clusters(self, query: str, field: Optional[str], limit: int) -> list:
+        async with _session() as session:
+            return await ClusterService.search_clusters(query, session, field=field, limit=limit)
+
+    async def aclose(self):
+        pass
+
+
+_backend: Optional[Union[ApiBackend, ServiceBackend]] = None
+
+
+def _http_client(settings) -> httpx.AsyncClient:
+    if settings.mcp_transport == "asgi":
+        from main import app
+
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp/api/v1")
+    return httpx.AsyncClient(
+        base_url=settings.mcp_base_url,
+        http2=settings.mcp_http2,
+        limits=httpx.Limits(
+            max_connections=settings.mcp_max_connections,
+            max_keepalive_connections=settings.mcp_max_keepalive_connections,
+            keepalive_expiry=settings.mcp_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.mcp_timeout, connect=settings.mcp_connect_timeout),
+    )
+
+
+def get_backend() -> Union[ApiBackend, ServiceBackend]:
+    """
+    The process-wide backend for the configured MCP_TRANSPORT.
+
+    In "http" mode every tool call and resource read, across all MCP sessions, reuses one client's
+    kept-alive connections instead of paying a TCP (and TLS) handshake per call.
+    """
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        _backend = ServiceBackend() if settings.mcp_transport == "direct" else ApiBackend(_http_client(settings))
+    return _backend
+
+
+async def close_backend():
+    global _backend
+    if _backend is not None:
+        await _backend.aclose()
+        _backend = None
+
+
+class ResourceCache:
+    """
+    Resource bodies by URI, so an agent re-reading the same resource does not go back to the API each time.
+
+    An entry is served from memory for ttl seconds. After that it is revalidated: the ETag goes back to the API
+    as If-None-Match and a 304 renews the entry without transferring the body. Entries without an ETag, or with
+    revalidation off, are fetched again. Concurrent misses for one URI share a single backend call, and a change
+    event drops the affected entries at once instead of waiting out the TTL.
+    """
+
+    def __init__(self, ttl: float, max_entries: int, revalidate: bool = True):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.revalidate = revalidate
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[float, Read]] = OrderedDict()
+        self._flights = SingleFlight("mcp_resources")
+        # Bumped by every invalidation; a load that started before one must not store what it read.
+        self._generation = 0
+
+    async def read(self, uri: str, load) -> Optional[str]:
+        """The body of uri, calling load(etag) -> Optional[Read] on a miss or expiry. None (not cached) if load finds nothing."""
+        entry = self._entries.get(uri)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(uri)
+            self.hits += 1
+            return entry[1].text
+        # Keyed by generation too, so a re-read after an invalidation starts a new load instead of joining an older one.
+        generation = self._generation
+        return await self._flights.do(f"{uri}#{generation}", lambda: self._load(uri, load, generation))
+
+    async def _load(self, uri: str, load, generation: int) -> Optional[str]:
+        entry = self._entries.get(uri)
+        cached = entry[1] if entry is not None else None
+        read = await load(cached.etag if cached is not None and self.revalidate else None)
+        if read is None:
+            self._entries.pop(uri, None)
+            return None
+        if read.text is None:
+            self.revalidations += 1
+            read = cached
+        else:
+            self.misses += 1
+        if generation == self._generation:
+            self._entries[uri] = (time.monotonic() + self.ttl, read)
+            self._entries.move_to_end(uri)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return read.text
+
+    def invalidate(self, uris: Optional[set[str]] = None):
+        """Drop the given URIs, or every entry when uris is None."""
+        self._generation += 1
+        if uris is None:
+            self._entries.clear()
+        for uri in uris or ():
+            self._entries.pop(uri, None)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "revalidations": self.revalidations, "misses": self.misses}
+
+
+@lru_cache
+def get_resource_cache() -> ResourceCache:
+    settings = get_settings()
+    return ResourceCache(settings.mcp_cache_ttl_seconds, settings.mcp_cache_max_entries, settings.mcp_cache_revalidate)
+
+
+class ResourceSubscriptions:
+    """Resource URIs each MCP session subscribed to; sessions are held weakly and dropped once closed."""
+
+    def __init__(self):
+        self._sessions: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def add(self, session, uri: str):
+        self._sessions.setdefault(session, set()).add(uri)
+
+    def remove(self, session, uri: str):
+        self._sessions.get(session, set()).discard(uri)
+
+    async def notify(self, uris: Optional[set[str]] = None):
+        """Send resources/updated for the subscribed URIs among uris (all of them when uris is None)."""
+        for session, subscribed in list(self._sessions.items()):
+            for uri in sorted(subscribed if uris is None else subscribed & uris):
+                try:
+                    await session.send_resource_updated(AnyUrl(uri))
+                except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+                    self._sessions.pop(session, None)
+                    break
+
+
+subscriptions = ResourceSubscriptions()
+
+
+def _changed_uris(event: dict) -> Optional[set[str]]:
+    """Resources a change event makes stale; None when the feed could not say (a reset or a lagged subscriber)."""
+    if event["type"] in ("reset", "lagged"):
+        return None
+    names = event.get("names") or [event.get("name"), event.get("previous_name")]
+    return {CLUSTER_LIST_URI, CLUSTER_SUMMARY_URI, *(_cluster_uri(name) for name in names if name)}
+
+
+async def _local_changes():
+    """Events from the in-process change feed (asgi and direct transports share the API's process)."""
+    from src.clusters.events import get_change_feed
+
+    while True:
+        # A subscriber that lags is cut off after a final "lagged" event; subscribe again from now.
+        async for event in get_change_feed().subscribe():
+            if event is not None:
+                yield event
+
+
+async def _remote_changes(client: httpx.AsyncClient):
+    """Events from the API's /clusters/changes stream, reconnecting with Last-Event-ID so missed events are replayed."""
+    last_event_id = None
+    delay = 1.0
+    while True:
+        try:
+            headers = {"Last-Event-ID": str(last_event_id)} if last_event_id is not None else None
+            async with client.stream("GET", "/clusters/changes", headers=headers) as response:
+                response.raise_for_status()
+                delay = 1.0
+                async for line in response.aiter_lines():
+                    if line.startswith("data:"):
+                        event = orjson.loads(line[len("data:") :])
+                        last_event_id = event["seq"]
+                        yield event
+        except httpx.HTTPError as exc:
+            logger.warning("Cluster change stream failed (%s); reconnecting in %.0fs", exc, delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, 30.0)
+
+
+async def watch_changes():
+    """Drop cached resources a change makes stale and tell subscribed clients to re-read them."""
+    # In-process transports see every worker's writes with CHANGE_FEED_BACKEND=redis, else only this process's; the TTL covers the rest.
+    events = _remote_changes(get_backend().client) if get_settings().mcp_transport == "http" else _local_changes()
+    async for event in events:
+        uris = _changed_uris(event)
+        get_resource_cache().invalidate(uris)
+        await subscriptions.notify(uris)
+
+
+def _enable_resource_subscriptions(server: FastMCP):
+    """Handle resources/subscribe and advertise it, through the low-level server FastMCP does not expose.
+
+    These are SDK internals (hence the pinned mcp version): if an upgrade moves them this fails at startup
+    instead of silently dropping subscribe support.
+    """
+    lowlevel = getattr(server, "_mcp_server", None)
+    # Checked on the class: request_context raises LookupError outside a request.
+    missing = [name for name in ("subscribe_resource", "unsubscribe_resource", "get_capabilities", "request_context") if not hasattr(type(lowlevel), name)]
+    if missing:
+        raise RuntimeError(f"mcp SDK internals changed (FastMCP._mcp_server lacks {', '.join(missing)}); resource subscriptions need porting")
+
+    @lowlevel.subscribe_resource()
+    async def subscribe_resource(uri: AnyUrl):
+        subscriptions.add(lowlevel.request_context.session, str(uri))
+
+    @lowlevel.unsubscribe_resource()
+    async def unsubscribe_resource(uri: AnyUrl):
+        subscriptions.remove(lowlevel.request_context.session, str(uri))
+
+    get_capabilities = lowlevel.get_capabilities
+
+    def capabilities_with_subscribe(*args, **kwargs):
+        # The SDK always advertises resources.subscribe=False, even with a subscribe handler registered.
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    lowlevel.get_capabilities = capabilities_with_subscribe
+    resources = lowlevel.get_capabilities(NotificationOptions(), {}).resources
+    if resources is None or not resources.subscribe:
+        raise RuntimeError("mcp SDK internals changed: resources.subscribe is not advertised; resource subscriptions need porting")
+
+
+_enable_resource_subscriptions(mcp)
 
 
 @mcp.tool()
@@ -19,21 +368,117 @@ async def register_user(user_data: RegisterReq) -> dict:
     Returns:
         dict: Registered user data (id, name, username, email).
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{BASE_URL}/auth/register", json=user_data.model_dump())
-        return response.json()
+    return await get_backend().register_user(user_data)
 
 
-@mcp.resource("clusters://")
+@mcp.resource(CLUSTER_LIST_URI)
 async def get_all_clusters() -> str:
     """
-    Returns all clusters available in the infra.
-    Load this to answer any questions about clusters - ownership, status, org.
+    Returns the first page of clusters available in the infra.
+    Prefer clusters://summary for counts, clusters://{name} for one cluster, and the list_clusters or
+    search_clusters tools for filtered lookups; they return only what the question needs.
+    Subscribe to be notified when it changes instead of re-reading it.
+    """
+    return await get_resource_cache().read(CLUSTER_LIST_URI, get_backend().get_all_clusters)
+
+
+@mcp.resource(CLUSTER_SUMMARY_URI, mime_type="application/json")
+async def get_cluster_summary() -> str:
+    """
+    Cluster counts: total, active and inactive, plus totals per org and per owner.
+    Load this to answer "how many" questions without reading the inventory.
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/clusters/")
-        return response.text
+    return await get_resource_cache().read(CLUSTER_SUMMARY_URI, get_backend().get_cluster_stats)
+
+
+@mcp.resource("clusters://{name}", mime_type="application/json")
+async def get_cluster(name: str) -> str:
+    """
+    One cluster by exact name: owner, org, active status and version.
+    """
+    cluster = await get_resource_cache().read(_cluster_uri(name), lambda etag: get_backend().get_cluster(name, etag))
+    if cluster is None:
+        raise ValueError(f"Cluster '{name}' does not exist.")
+    return cluster
+
+
+@mcp.tool()
+async def list_clusters(
+    org: Optional[str] = None,
+    owner: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    limit: Annotated[int, Field(ge=1, le=MAX_TOOL_PAGE_SIZE)] = 20,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    List clusters matching every given filter, one page at a time, ordered by name.
+
+    Args:
+        org: Only clusters in this org.
+        owner: Only clusters with this owner.
+        is_active: Only active (true) or only inactive (false) clusters.
+        limit: Page size.
+        cursor: next_cursor from the previous page, to continue the same listing.
+    Returns:
+        dict: {"items": [clusters], "next_cursor": cursor for the next page, or null on the last page}.
+    """
+    return await get_backend().list_clusters(limit=limit, cursor=cursor, org=org, owner=owner, is_active=is_active)
+
+
+@mcp.tool()
+async def search_clusters(
+    query: str,
+    field: Optional[Literal["name", "owner", "org"]] = None,
+    limit: Annotated[int, Field(ge=1, le=MAX_TOOL_SEARCH_RESULTS)] = 10,
+) -> list:
+    """
+    Find clusters whose name, owner or org contains the query (case-insensitive), name-prefix matches first.
+
+    Args:
+        query: Text to look for; one or two characters match as a prefix only.
+        field: Restrict the match to one field instead of all three.
+        limit: Maximum number of clusters returned.
+    Returns:
+        list: Matching clusters.
+    """
+    return await get_backend().search_clusters(query, field, limit)
+
+
+async def _cancel(task: asyncio.Task):
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+def streamable_http_app():
+    """
+    The streamable-http app with the backend opened at startup and closed at shutdown.
+
+    FastMCP's own lifespan runs once per MCP session, so the backend is tied to the Starlette app instead.
+    In-process transports also run the API's lifespan, so the engine pool and bcrypt threads are warmed
+    and released exactly as in the API process.
+    """
+    app = mcp.streamable_http_app()
+    run_session_manager = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with AsyncExitStack() as stack:
+            if get_settings().mcp_transport != "http":
+                from main import app as api
+
+                await stack.enter_async_context(api.router.lifespan_context(api))
+            get_backend()
+            stack.push_async_callback(close_backend)
+            if get_settings().mcp_watch_changes:
+                watcher = asyncio.create_task(watch_changes())
+                stack.push_async_callback(_cancel, watcher)
+            await stack.enter_async_context(run_session_manager(app))
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
 
 
 if __name__ == "__main__":
-    mcp.run(transport="streamable-http")
+    uvicorn.run(streamable_http_app(), host=mcp.settings.host, port=mcp.settings.port, log_level=mcp.settings.log_level.lower())
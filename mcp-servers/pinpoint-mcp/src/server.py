@@ -1,7 +1,26 @@
+import sys
+from contextlib import asynccontextmanager
+
 from mcp.server.fastmcp import FastMCP
+from tools.scanner.browser_pool import browser_pool
 from tools.team_lead.team_lead import run as team_lead_run
 
-mcp = FastMCP("pinpoint-mcp")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    # Warm the browser before the first call so scans never pay for a launch.
+    # A failed warm-up is not fatal: the pool retries on the first scan and the tool reports the error.
+    try:
+        await browser_pool.start()
+    except Exception as exc:
+        print(f"[server] browser warm-up failed: {exc}", file=sys.stderr)
+    try:
+        yield
+    finally:
+        await browser_pool.close()
+
+
+mcp = FastMCP("pinpoint-mcp", lifespan=lifespan)
 
 
 # async def analyze_page(url: str) -> dict:
@@ -0,0 +1,159 @@
+import asyncio
+import sys
+from contextlib import asynccontextmanager, suppress
+
+from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+from playwright.async_api import Error as PlaywrightError
+
+POOL_SIZE      = 2      # contexts kept warm = scans that can run at once
+SHUTDOWN_GRACE = 10.0   # seconds close() waits for running scans
+
+
+def _log(message: str) -> None:
+    # stdout carries the MCP stdio protocol, so pool lifecycle messages go to stderr
+    print(f"[browser_pool] {message}", file=sys.stderr)
+
+
+class _PooledContext:
+    def __init__(self, browser: Browser, context: BrowserContext):
+        self.browser = browser
+        self.context = context
+
+
+class BrowserPool:
+    """
+    One long-lived Chromium process shared by every scan, and a fixed set of
+    browser contexts handed out one per scan.
+
+    A context is an isolated, incognito-style profile, and each one serves a
+    single scan: when the scan ends the context is closed and a fresh one is
+    opened in its place, so cookies, localStorage, sessionStorage, service
+    workers and HTTP cache never carry over from one site to the next.
+    Contexts are cheap; the browser launch is the expensive part, and that
+    happens once. If the browser process dies it is relaunched on the next
+    scan.
+    """
+
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+
+        self._playwright    = None
+        self._browser:  Browser | None       = None
+        self._slots:    asyncio.Queue | None = None   # idle contexts; None = rebuild on next use
+        self._start_lock    = asyncio.Lock()
+        self._browser_lock  = asyncio.Lock()
+        self._in_use        = 0
+        self._drained       = asyncio.Event()
+        self._closing       = False
+        self._drained.set()
+
+    async def start(self) -> None:
+        """Launch the browser and warm every context. Safe to call more than once."""
+        async with self._start_lock:
+            if self._slots is not None:
+                return
+            slots = asyncio.Queue()
+            for _ in range(self.size):
+                slots.put_nowait(await self._new_context())
+            self._slots = slots
+            _log(f"ready — {self.size} context(s), a fresh one per scan")
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a fresh context for one scan and yield a page in it."""
+        if self._closing:
+            raise RuntimeError("browser pool is shutting down")
+        await self.start()
+
+        slot = await self._slots.get()
+        self._in_use += 1
+        self._drained.clear()
+        try:
+            if not self._is_healthy(slot):
+                await self._discard(slot)
+                slot = None
+                slot = await self._new_context()
+
+            page: Page = await slot.context.new_page()
+            yield page   # the page closes with its context on release
+        finally:
+            await self._release(slot)
+
+    async def close(self, grace: float = SHUTDOWN_GRACE) -> None:
+        """Stop handing out contexts, let running scans finish, then shut the browser down."""
+        if self._slots is None:
+            return
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._drained.wait(), grace)
+        except TimeoutError:
+            _log(f"{self._in_use} scan(s) still running after {grace:.0f}s — closing anyway")
+
+        while not self._slots.empty():
+            await self._discard(self._slots.get_nowait())
+        if self._browser is not None:
+            with suppress(PlaywrightError):
+                await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+        self._playwright = None
+        self._browser    = None
+        self._slots      = None
+        # _closing stays set: a scan that outlived the grace period must not refill the pool or relaunch the browser.
+        _log("closed")
+
+    # -----------------------------------------------------------------------
+
+    def _is_healthy(self, slot: _PooledContext | None) -> bool:
+        return (
+            slot is not None
+            and slot.browser is self._browser
+            and slot.browser.is_connected()
+        )
+
+    async def _ensure_browser(self) -> Browser:
+        async with self._browser_lock:
+            if self._closing:
+                raise RuntimeError("browser pool is shutting down")
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            elif self._browser is not None:
+                _log("browser disconnected — relaunching")
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            return self._browser
+
+    async def _new_context(self) -> _PooledContext:
+        browser = await self._ensure_browser()
+        return _PooledContext(browser, await browser.new_context())
+
+    async def _discard(self, slot: _PooledContext | None) -> None:
+        if slot is not None:
+            with suppress(PlaywrightError):
+                await slot.context.close()
+
+    async def _release(self, slot: _PooledContext | None) -> None:
+        # The used context is always closed; its replacement is opened now so the next scan starts warm.
+        # Always hand a slot back, so a failed replacement never shrinks the pool.
+        # Once closing, nothing new is launched.
+        try:
+            await self._discard(slot)
+            slot = None
+            if not self._closing:
+                try:
+                    slot = await self._new_context()
+                except (PlaywrightError, RuntimeError) as exc:
+                    _log(f"could not replace context ({exc}) — retrying on next scan")
+        finally:
+            if self._closing or self._slots is None:
+                await self._discard(slot)
+            else:
+                self._slots.put_nowait(slot)
+            self._in_use -= 1
+            if self._in_use == 0:
+                self._drained.set()
+
+
+browser_pool = BrowserPool()
@@ -1,5 +1,5 @@
 import re
-from playwright.async_api import async_playwright
+from tools.scanner.browser_pool import browser_pool
 
 ELEMENT_CAP      = 20
 MAX_RETRIES      = 2
@@ -7,9 +7,8 @@ FAILURE_THRESHOLD = 0.75   # retry the whole scan if > 75 % of selectors fail va
 
 
 async def scan_page(url: str) -> dict:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        page    = await browser.new_page()
+    # pages come from the shared, pre-warmed browser — no launch per scan
+    async with browser_pool.page() as page:
         await page.goto(url, timeout=15_000, wait_until="domcontentloaded")
 
         page_meta = {
@@ -58,8 +57,6 @@ async def scan_page(url: str) -> dict:
             }
             break
 
-        await browser.close()
-
     return {
         "page":        page_meta,
         "selectors":   selectors,